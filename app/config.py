@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -42,5 +43,12 @@ class Settings(BaseSettings):
         case_sensitive=True,
     )
 
-# Create global settings object
-settings = Settings()
\ No newline at end of file
+@lru_cache
+def get_settings() -> Settings:
+    """Build the settings object on first use.
+
+    Parsing .env and validating every field at import time costs each
+    serverless cold start even when the invocation never reads a setting;
+    the lru_cache keeps it a one-time cost per process.
+    """
+    return Settings()
\ No newline at end of file
@@ -1,19 +1,128 @@
-from fastapi import FastAPI, HTTPException, Query, Response, File, Form, UploadFile
+from fastapi import FastAPI, HTTPException, Query, Request, Response, File, Form, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+
+# Serialize responses with orjson (Rust, several times faster than stdlib
+# json for dict/list payloads) when it is installed
+try:
+    import orjson  # type: ignore # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    DefaultJSONResponse = JSONResponse  # type: ignore
+    _ORJSON_AVAILABLE = False
 from pydantic import BaseModel, Field
 from typing import Optional, List
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import hashlib
+import json
+import os
 import re
-import httpx
 import time
+from datetime import datetime, timezone
 
 from .storage import JSONStorage
-from .config import settings
+from .config import get_settings
+
+# Compiled once at import; these run on every /legal-qa request
+_SANITIZE_RE = re.compile(r'[^\w\s\-.,?!]')
+_WS_RE = re.compile(r'\s+')
+
+# ASCII questions (the overwhelming majority) are sanitized with a
+# precomputed str.translate deletion table — one pass in C with no regex
+# engine involved; the table deletes exactly the ASCII characters the
+# regex would strip
+_ASCII_DELETE_TABLE = str.maketrans('', '', ''.join(
+    ch for ch in map(chr, range(128)) if _SANITIZE_RE.match(ch)
+))
+
+def _sanitize_question(question: str) -> str:
+    """Strip characters outside the allowed set, fast-pathing ASCII input."""
+    if question.isascii():
+        return question.translate(_ASCII_DELETE_TABLE)
+    return _SANITIZE_RE.sub('', question)
+
+# Optional document parsers. PyMuPDF (fitz) is a C/C++ engine roughly an
+# order of magnitude faster than PyPDF2's pure-Python page extraction, so
+# it is preferred when installed; PyPDF2 stays as the fallback.
+try:
+    import fitz  # type: ignore  # PyMuPDF
+    _FITZ_AVAILABLE = True
+except Exception:
+    fitz = None  # type: ignore
+    _FITZ_AVAILABLE = False
+
+try:
+    import PyPDF2  # type: ignore
+    _PYPDF2_AVAILABLE = True
+except Exception:
+    PyPDF2 = None  # type: ignore
+    _PYPDF2_AVAILABLE = False
+
+try:
+    import docx  # type: ignore  # python-docx
+    _DOCX_AVAILABLE = True
+except Exception:
+    docx = None  # type: ignore
+    _DOCX_AVAILABLE = False
+
+try:
+    import ahocorasick  # type: ignore  # pyahocorasick
+    _AHOCORASICK_AVAILABLE = True
+except Exception:
+    ahocorasick = None  # type: ignore
+    _AHOCORASICK_AVAILABLE = False
+
+# Semantic cache needs sentence-transformers + numpy; fall back to the
+# exact-match LRU alone when they are not installed
+try:
+    from .semantic_cache import SemanticCache
+    _semantic_cache: Optional[SemanticCache] = SemanticCache()
+except Exception:
+    _semantic_cache = None
+
+# httpx is only needed by the Gemini fallback; importing it lazily keeps
+# ~200ms of import work and a few MB of RSS off serverless cold starts
+# for the dominant locally-answered traffic
+_http_client = None
+
+def _get_http_client():
+    """Build the shared pooled AsyncClient on first Gemini call.
+
+    Reusing one client keeps connections to the Gemini API alive across
+    requests instead of paying a TCP+TLS handshake per call.
+    """
+    global _http_client
+    if _http_client is None:
+        import httpx
+        kwargs = dict(
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+        try:
+            # HTTP/2 multiplexes concurrent Gemini calls over one
+            # connection; needs the optional h2 package
+            _http_client = httpx.AsyncClient(http2=True, **kwargs)
+        except ImportError:
+            _http_client = httpx.AsyncClient(**kwargs)
+    return _http_client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    if _http_client is not None:
+        await _http_client.aclose()
 
 app = FastAPI(
     title="Legal AI System",
     description="API for legal document analysis and question answering",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS with all necessary origins
@@ -30,7 +139,9 @@ origins = [
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # Use specific origins instead of "*"
-    allow_origin_regex=r"https://lawai-frontend-.*\.vercel\.app$",
+    # Anchored with an explicit character class so non-matching origins
+    # fail without backtracking; covers the rotating Vercel preview URLs
+    allow_origin_regex=r"\Ahttps://lawai-frontend-[a-z0-9-]+\.vercel\.app\Z",
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],  # Specify allowed methods
     allow_headers=["Content-Type", "Authorization", "Accept"],  # Specify allowed headers
@@ -38,8 +149,98 @@ app.add_middleware(
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
-# Initialize storage
-storage = JSONStorage()
+# Compress larger responses (the QA list endpoints return long legal text)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+@lru_cache(maxsize=1)
+def get_storage() -> JSONStorage:
+    """Lazily build the storage singleton on first use.
+
+    Keeps serverless cold starts from paying the data load when the
+    invocation never touches storage; JSONStorage itself watches the
+    file mtime so edits are picked up without a restart.
+    """
+    return JSONStorage()
+
+# LRU cache of similarity results keyed on the data version plus the
+# normalized question, so hot questions (repeated FAQs) skip the
+# similarity scan entirely while edits to qa_data.json invalidate every
+# stale entry (same version source the /api/qa-pairs ETag uses)
+_SIMILAR_CACHE_MAX = 1024
+_similar_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+def _similar_cache_get(norm_q: str) -> Optional[tuple]:
+    key = (get_storage().get_data_version(), norm_q)
+    result = _similar_cache.get(key)
+    if result is not None:
+        _similar_cache.move_to_end(key)
+    return result
+
+def _similar_cache_put(norm_q: str, result: tuple):
+    _similar_cache[(get_storage().get_data_version(), norm_q)] = result
+    if len(_similar_cache) > _SIMILAR_CACHE_MAX:
+        _similar_cache.popitem(last=False)
+
+# Micro-batching: questions arriving within a short window are coalesced
+# into a single storage.find_similar_questions_batch call, amortizing the
+# per-call corpus scan across concurrent requests
+_BATCH_WINDOW = 0.005  # seconds
+_BATCH_MAX = 32
+_batch_queue: Optional[asyncio.Queue] = None
+_batch_task: Optional[asyncio.Task] = None
+_batch_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def _batch_worker():
+    loop = asyncio.get_running_loop()
+    while True:
+        items = [await _batch_queue.get()]
+        deadline = loop.time() + _BATCH_WINDOW
+        while len(items) < _BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(_batch_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            results = get_storage().find_similar_questions_batch([q for q, _ in items])
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+async def _find_similar_batched(norm_q: str) -> List[dict]:
+    """Enqueue a question for the batch worker and await its result."""
+    global _batch_queue, _batch_task, _batch_loop
+    loop = asyncio.get_running_loop()
+    # Recreate the queue/worker if the event loop changed (test clients and
+    # serverless runtimes can run each request on a fresh loop)
+    if _batch_queue is None or _batch_loop is not loop:
+        _batch_queue = asyncio.Queue()
+        _batch_loop = loop
+        _batch_task = loop.create_task(_batch_worker())
+    future = loop.create_future()
+    await _batch_queue.put((norm_q, future))
+    return await future
+
+# TTL cache of Gemini answers: the fallback is slow and billed per call,
+# so identical questions within the TTL are served from memory. Per-key
+# locks stop concurrent misses from issuing duplicate API calls.
+_GEMINI_CACHE_TTL = 86400.0  # seconds
+# Failures (timeouts, quota errors) are remembered briefly too, so a
+# burst of the same unanswerable question doesn't hammer the API
+_GEMINI_NEGATIVE_TTL = 300.0
+_GEMINI_CACHE_MAX = 2048
+_gemini_cache: "OrderedDict[bytes, tuple]" = OrderedDict()  # key -> (expires_at, answer)
+_gemini_locks: dict = {}
+
+def _gemini_cache_key(question: str) -> bytes:
+    return hashlib.sha1(question.strip().lower().encode()).digest()
 
 class QuestionRequest(BaseModel):
     question: str = Field(..., min_length=1, max_length=1000)
@@ -49,9 +250,38 @@ class ErrorResponse(BaseModel):
     detail: str
 
 async def fetch_gemini_answer(question: str) -> Optional[str]:
+    """Cached wrapper around the Gemini fallback.
+
+    Serves repeat questions from a TTL cache and serializes concurrent
+    misses for the same question so the API is hit at most once per key.
+    """
+    key = _gemini_cache_key(question)
+    entry = _gemini_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        _gemini_cache.move_to_end(key)
+        return entry[1]
+
+    lock = _gemini_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            # Another waiter may have filled the cache while we queued
+            entry = _gemini_cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            answer = await _fetch_gemini_answer_uncached(question)
+            ttl = _GEMINI_CACHE_TTL if answer is not None else _GEMINI_NEGATIVE_TTL
+            _gemini_cache[key] = (time.monotonic() + ttl, answer)
+            if len(_gemini_cache) > _GEMINI_CACHE_MAX:
+                _gemini_cache.popitem(last=False)
+            return answer
+    finally:
+        _gemini_locks.pop(key, None)
+
+async def _fetch_gemini_answer_uncached(question: str) -> Optional[str]:
     """Call Google Gemini API to get an answer as a fallback.
     Returns the response text or None on failure.
     """
+    settings = get_settings()
     api_key = settings.GEMINI_API_KEY
     if not api_key:
         return None
@@ -72,22 +302,23 @@ async def fetch_gemini_answer(question: str) -> Optional[str]:
         ]
     }
     try:
-        timeout = httpx.Timeout(15.0, connect=5.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(url, json=payload)
-            if resp.status_code != 200:
-                return None
+        resp = await _get_http_client().post(url, json=payload)
+        if resp.status_code != 200:
+            return None
+        if _ORJSON_AVAILABLE:
+            data = orjson.loads(resp.content)
+        else:
             data = resp.json()
-            # Expected: candidates[0].content.parts[0].text
-            candidates = data.get("candidates") or []
-            if not candidates:
-                return None
-            content = candidates[0].get("content") or {}
-            parts = content.get("parts") or []
-            if not parts:
-                return None
-            text = parts[0].get("text")
-            return text
+        # Expected: candidates[0].content.parts[0].text
+        candidates = data.get("candidates") or []
+        if not candidates:
+            return None
+        content = candidates[0].get("content") or {}
+        parts = content.get("parts") or []
+        if not parts:
+            return None
+        text = parts[0].get("text")
+        return text
     except Exception:
         return None
 
@@ -99,6 +330,7 @@ async def health_check():
 @app.get("/")
 async def root():
     """Root endpoint with API info and links."""
+    settings = get_settings()
     return {
         "name": settings.PROJECT_NAME,
         "version": settings.VERSION,
@@ -126,9 +358,31 @@ async def legal_qa(request: QuestionRequest):
             raise HTTPException(status_code=400, detail="Question cannot be empty")
         
         # Remove any potentially harmful characters
-        question = re.sub(r'[^\w\s\-.,?!]', '', question)
+        question = _sanitize_question(question)
+
+        # Normalize before the cache lookup so trivially different phrasings
+        # ("What is bail?" vs "what is bail ?") share a cache entry
+        norm_q = _WS_RE.sub(' ', question.lower().strip())
+
+        # Semantic-cache hit: a near-duplicate question was already answered
+        if _semantic_cache is not None:
+            cached_response = _semantic_cache.lookup(norm_q)
+            if cached_response is not None:
+                return cached_response
+
+        # Exact corpus hit: answer in O(1) without any similarity scan
+        exact = get_storage().find_exact(norm_q)
+        if exact is not None:
+            return {
+                "answer": exact['answer'],
+                "confidence": 1.0,
+                "category": exact.get('category', 'general')
+            }
 
-        similar_questions = storage.find_similar_questions(question)
+        similar_questions = _similar_cache_get(norm_q)
+        if similar_questions is None:
+            similar_questions = tuple(await _find_similar_batched(norm_q))
+            _similar_cache_put(norm_q, similar_questions)
         
         if not similar_questions:
             # Fallback to Gemini if no local answer
@@ -148,23 +402,31 @@ async def legal_qa(request: QuestionRequest):
             }
         
         best_match = similar_questions[0]
-        # Calculate confidence based on question similarity
+        # Calculate confidence based on question similarity; the corpus side
+        # is pre-lowercased at load time so only the user question pays a
+        # casefold here
         question_lower = question.lower()
-        best_match_lower = best_match['question'].lower()
-        
-        # Improved confidence calculation
-        if question_lower == best_match_lower:
-            confidence = 1.0
-        elif question_lower in best_match_lower or best_match_lower in question_lower:
-            confidence = 0.8
+        best_match_lower = best_match.get('_qlower') or best_match['question'].lower()
+
+        # Equal-length strings can only match exactly, and for unequal
+        # lengths only shorter-in-longer containment is possible — so each
+        # request does one comparison instead of an equality check plus two
+        # substring scans
+        if len(question_lower) == len(best_match_lower):
+            confidence = 1.0 if question_lower == best_match_lower else 0.5
+        elif len(question_lower) < len(best_match_lower):
+            confidence = 0.8 if question_lower in best_match_lower else 0.5
         else:
-            confidence = 0.5
+            confidence = 0.8 if best_match_lower in question_lower else 0.5
         
-        return {
+        response = {
             "answer": best_match['answer'],
             "confidence": confidence,
             "category": best_match.get('category', 'general')
         }
+        if _semantic_cache is not None:
+            _semantic_cache.store(norm_q, response)
+        return response
     except HTTPException as he:
         raise he
     except Exception as e:
@@ -175,13 +437,25 @@ async def legal_qa(request: QuestionRequest):
 
 @app.get("/api/qa-pairs")
 async def get_qa_pairs(
+    request: Request,
     category: Optional[str] = None,
     limit: int = Query(default=10, ge=1, le=100)  # Add validation for limit
 ):
     """Get Q&A pairs with optional category filter."""
     try:
+        storage = get_storage()
+        # The response only changes when the data file does; let clients
+        # revalidate with an ETag keyed on data version + query params
+        etag = '"%s"' % hashlib.md5(
+            f"{storage.get_data_version()}|{category}|{limit}".encode()
+        ).hexdigest()
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
         qa_pairs = storage.get_qa_pairs(category=category, limit=limit)
-        return {"qa_pairs": qa_pairs, "total": len(qa_pairs)}
+        return DefaultJSONResponse(
+            {"qa_pairs": qa_pairs, "total": len(qa_pairs)},
+            headers={"ETag": etag, "Cache-Control": "public, max-age=60"}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -192,35 +466,286 @@ async def get_qa_pairs(
 async def get_categories():
     """Get all available categories."""
     try:
-        categories = storage.get_categories()
-        return {"categories": categories, "total": len(categories)}
+        categories = get_storage().get_categories()
+        return DefaultJSONResponse(
+            {"categories": categories, "total": len(categories)},
+            headers={"Cache-Control": "public, max-age=300"}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch categories: {str(e)}"
         )
 
+# Below this page count the thread fan-out costs more than it saves
+_PDF_PARALLEL_MIN_PAGES = 8
+
+def extract_text_from_pdf(stream) -> str:
+    """Extract text from a PDF upload, preferring the PyMuPDF engine."""
+    if _FITZ_AVAILABLE:
+        # fitz needs the bytes; PyPDF2 below can read the stream as-is
+        contents = stream.read()
+        doc = fitz.open(stream=contents, filetype="pdf")
+        try:
+            n = doc.page_count
+            if n >= _PDF_PARALLEL_MIN_PAGES:
+                # get_text releases the GIL, so pages extract in parallel.
+                # fitz Documents are not thread-safe to share, so each
+                # worker opens its own view of the same bytes.
+                from concurrent.futures import ThreadPoolExecutor
+
+                def _extract_page(i: int) -> str:
+                    d = fitz.open(stream=contents, filetype="pdf")
+                    try:
+                        return d.load_page(i).get_text("text")
+                    finally:
+                        d.close()
+
+                with ThreadPoolExecutor(max_workers=min(8, n)) as ex:
+                    texts = list(ex.map(_extract_page, range(n)))
+            else:
+                # "text" is the fastest extraction mode; richer modes like
+                # "dict"/"blocks" cost several times more for no benefit here
+                texts = [page.get_text("text") for page in doc]
+        finally:
+            doc.close()
+        return "\n".join(texts).strip()
+    if _PYPDF2_AVAILABLE:
+        reader = PyPDF2.PdfReader(stream)
+        return "\n".join(page.extract_text() or '' for page in reader.pages).strip()
+    return ""
+
+def extract_text_from_docx(stream) -> str:
+    """Extract text from a DOCX upload; empty string if python-docx is missing."""
+    if not _DOCX_AVAILABLE:
+        return ""
+    document = docx.Document(stream)
+    return "\n".join(p.text for p in document.paragraphs).strip()
+
+def extract_text_from_txt(stream) -> str:
+    """Decode a plain-text upload."""
+    return stream.read().decode("utf-8", errors="ignore").strip()
+
+def lightweight_summarize(text: str, max_chars: int = 500) -> str:
+    """Cheap extractive summary: normalized leading text cut at a sentence."""
+    # Short text with no whitespace runs is already its own summary
+    if len(text) <= max_chars and '\n' not in text and '\t' not in text and '  ' not in text:
+        return text.strip()
+    text = _WS_RE.sub(' ', text).strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    period = cut.rfind('. ')
+    if period > 0:
+        return cut[:period + 1]
+    return cut + "..."
+
+# Keyword heuristics for document categorization, matching the category
+# names used by the QA corpus
+_CATEGORY_KEYWORDS = {
+    "criminal_law": ["ipc", "criminal", "offence", "offense", "accused", "bail", "fir"],
+    "contract_law": ["contract", "agreement", "consideration", "breach"],
+    "family_law": ["marriage", "divorce", "custody", "adoption", "maintenance"],
+    "property_law": ["property", "lease", "mortgage", "tenant", "conveyance"],
+}
+
+# One Aho-Corasick automaton over every category keyword: a single O(N)
+# scan of the document replaces one `in` pass per keyword, all in C
+if _AHOCORASICK_AVAILABLE:
+    _CATEGORY_AUTOMATON = ahocorasick.Automaton()
+    for _cat, _kws in _CATEGORY_KEYWORDS.items():
+        for _kw in _kws:
+            _CATEGORY_AUTOMATON.add_word(_kw, _cat)
+    _CATEGORY_AUTOMATON.make_automaton()
+    # Dict-order priority, so ties resolve the same way the loop did
+    _CATEGORY_PRIORITY = {cat: i for i, cat in enumerate(_CATEGORY_KEYWORDS)}
+else:
+    _CATEGORY_AUTOMATON = None
+
+def lightweight_categorize(text: str) -> str:
+    """Pick a coarse category from keyword hits; general_legal otherwise."""
+    t = text.lower()
+    if _CATEGORY_AUTOMATON is not None:
+        hits = {cat for _, cat in _CATEGORY_AUTOMATON.iter(t)}
+        if hits:
+            return min(hits, key=_CATEGORY_PRIORITY.__getitem__)
+        return "general_legal"
+    for category, keywords in _CATEGORY_KEYWORDS.items():
+        if any(k in t for k in keywords):
+            return category
+    return "general_legal"
+
+# Extraction pool: parsing blocks the event loop if run inline in the
+# async handler, serializing concurrent uploads. A thread pool suffices
+# because PyMuPDF releases the GIL inside get_text; it is created lazily
+# (like the HTTP client) so idle processes never pay for the threads.
+_extract_pool = None
+
+def _get_extract_pool():
+    global _extract_pool
+    if _extract_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _extract_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 4,
+            thread_name_prefix="extract",
+        )
+    return _extract_pool
+
+def _extract_dispatch(stream, content_type: str) -> str:
+    """Pick the extractor for a content type; runs on the worker pool.
+
+    ``stream`` is the upload's spooled temp file — parsers that accept a
+    file-like object read from it directly, so the whole upload is never
+    copied into a Python buffer.
+    """
+    if content_type == "application/pdf":
+        # Some clients label plain text as application/pdf; a real PDF
+        # always starts with the %PDF magic, so decode directly instead
+        # of handing non-PDF bytes to a parser that will choke on them
+        head = stream.read(16)
+        stream.seek(0)
+        if not head.lstrip()[:5].startswith(b"%PDF-"):
+            data = stream.read()
+            stream.seek(0)
+            try:
+                return data.decode("utf-8").strip()
+            except UnicodeDecodeError:
+                pass
+        return extract_text_from_pdf(stream)
+    if content_type == "text/plain":
+        return extract_text_from_txt(stream)
+    # python-docx only reads OOXML zips; legacy OLE .doc uploads
+    # (application/msword passes the type check) and malformed files
+    # raise here, and should fall through to the generic-summary branch
+    # rather than surface as a 500
+    try:
+        return extract_text_from_docx(stream)
+    except Exception:
+        return ""
+
+def _documents_log_path() -> str:
+    return os.path.join(get_settings().DATA_DIR, "documents.ndjson")
+
+def _documents_index_path() -> str:
+    return _documents_log_path() + ".idx"
+
+def _document_text_path(document_id: str) -> str:
+    return os.path.join(get_settings().DATA_DIR, "docs", f"{document_id}.txt")
+
+def _save_document_text(document_id: str, text: str):
+    """Write the full extracted text to its own blob file.
+
+    Keeping the text out of the metadata log means listing and lookups
+    parse small records regardless of how large the documents are.
+    """
+    path = _document_text_path(document_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def _dumps_bytes(obj) -> bytes:
+    return orjson.dumps(obj) if _ORJSON_AVAILABLE else json.dumps(obj).encode("utf-8")
+
+def _loads_bytes(raw: bytes):
+    return orjson.loads(raw) if _ORJSON_AVAILABLE else json.loads(raw)
+
+def _append_document(record: dict):
+    """Append one document record to the NDJSON log.
+
+    The previous documents.json was rewritten wholesale on every upload,
+    so upload cost grew with corpus size; an append is O(1). A sidecar
+    index maps document_id -> byte offset for random access.
+    """
+    with open(_documents_log_path(), 'ab') as f:
+        offset = f.tell()
+        f.write(_dumps_bytes(record) + b"\n")
+    try:
+        with open(_documents_index_path(), 'rb') as f:
+            index = _loads_bytes(f.read())
+    except (OSError, ValueError):
+        index = {}
+    index[record["id"]] = offset
+    with open(_documents_index_path(), 'wb') as f:
+        f.write(_dumps_bytes(index))
+
+def _iter_documents():
+    """Yield stored document records lazily, newest last."""
+    try:
+        with open(_documents_log_path(), 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _loads_bytes(line)
+    except OSError:
+        return
+
+def _get_document(document_id: str) -> dict | None:
+    """Fetch one record by id via the offset index, scanning as fallback."""
+    try:
+        with open(_documents_index_path(), 'rb') as f:
+            index = _loads_bytes(f.read())
+        offset = index.get(document_id)
+        if offset is not None:
+            with open(_documents_log_path(), 'rb') as f:
+                f.seek(offset)
+                return _loads_bytes(f.readline())
+    except (OSError, ValueError):
+        pass
+    for record in _iter_documents():
+        if record.get("id") == document_id:
+            return record
+    return None
+
+@app.get("/api/document/{document_id}/text")
+async def get_document_text(document_id: str):
+    """Return the full extracted text of an analyzed document."""
+    record = _get_document(document_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    try:
+        with open(_document_text_path(document_id), 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        text = record.get("text", "")  # records written before blob storage
+    return {"document_id": document_id, "text": text}
+
+@app.post("/admin/cache-clear")
+async def clear_cache():
+    """Clear the memoized similarity-search cache (e.g. after updating QA data)."""
+    _similar_cache.clear()
+    if _semantic_cache is not None:
+        _semantic_cache.clear()
+    return {"status": "cleared"}
+
 @app.post("/api/analyze-document")
 async def analyze_document(
     file: UploadFile = File(...),
     title: str = Form(...)
 ):
     """Analyze a legal document and provide a summary."""
+    settings = get_settings()
     try:
-        # Check file size
-        file_size = 0
-        contents = b""
-        
-        # Read file in chunks to avoid memory issues
-        while chunk := await file.read(1024 * 1024):  # 1MB chunks
-            contents += chunk
-            file_size += len(chunk)
-            if file_size > settings.MAX_DOCUMENT_SIZE:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File too large. Maximum size is {settings.MAX_DOCUMENT_SIZE/(1024*1024)}MB"
-                )
-        
+        # Reject oversized uploads before reading anything when the client
+        # declares a size
+        declared_size = getattr(file, "size", None)
+        if declared_size and declared_size > settings.MAX_DOCUMENT_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {settings.MAX_DOCUMENT_SIZE/(1024*1024)}MB"
+            )
+
+        # The upload already sits in starlette's spooled temp file (disk
+        # past 1MB), so size-check it with a seek instead of copying the
+        # whole body into a Python buffer
+        upload = file.file
+        upload.seek(0, os.SEEK_END)
+        if upload.tell() > settings.MAX_DOCUMENT_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {settings.MAX_DOCUMENT_SIZE/(1024*1024)}MB"
+            )
+        upload.seek(0)
+
+
         # Check content type
         content_type = file.content_type
         if content_type not in settings.SUPPORTED_DOCUMENT_TYPES:
@@ -229,13 +754,39 @@ async def analyze_document(
                 detail=f"Unsupported file type: {content_type}. Supported types: {', '.join(settings.SUPPORTED_DOCUMENT_TYPES)}"
             )
         
-        # For now, return a simple response
-        # In a real implementation, you would process the document and extract meaningful information
-        document_id = f"doc_{int(time.time())}"
-        
+        # Parse off the event loop so concurrent uploads extract in
+        # parallel instead of serializing behind one another
+        text = await asyncio.get_running_loop().run_in_executor(
+            _get_extract_pool(), _extract_dispatch, upload, content_type
+        )
+
+        # Nanosecond timestamps can't collide across uploads in the same
+        # second the way int(time.time()) did
+        ts_ns = time.time_ns()
+        document_id = f"doc_{ts_ns}"
+        if text:
+            summary = lightweight_summarize(text)
+            category = lightweight_categorize(text)
+        else:
+            # No parser available (or empty document): keep the generic reply
+            summary = f"Analysis of {title}: This appears to be a legal document related to Indian law."
+            category = "general_legal"
+
+        if text:
+            _save_document_text(document_id, text)
+        _append_document({
+            "id": document_id,
+            "title": title,
+            "category": category,
+            "summary": summary,
+            "created_at": datetime.fromtimestamp(
+                ts_ns // 1_000_000_000, tz=timezone.utc
+            ).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+        })
+
         return {
-            "summary": f"Analysis of {title}: This appears to be a legal document related to Indian law.",
-            "category": "general_legal",
+            "summary": summary,
+            "category": category,
             "document_id": document_id
         }
     except HTTPException as he:
@@ -244,4 +795,25 @@ async def analyze_document(
         raise HTTPException(
             status_code=500,
             detail=f"Failed to analyze document: {str(e)}"
-        )
\ No newline at end of file
+        )
+if __name__ == "__main__":
+    import os
+    import uvicorn
+
+    if os.getenv("ENV") == "prod":
+        # uvloop + httptools replace the stock asyncio loop and HTTP parser
+        # with C implementations; access logging is per-request stdlib
+        # logging we don't need in production
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=int(os.getenv("PORT", "8000")),
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", "4")),
+            access_log=False,
+        )
+    else:
+        # reload=True forces the default loop and a single worker; keep it
+        # for local development only
+        uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True)
@@ -0,0 +1,102 @@
+from typing import Optional
+
+try:
+    from sentence_transformers import SentenceTransformer  # type: ignore
+    _SENTENCE_TF_AVAILABLE = True
+except Exception:
+    SentenceTransformer = None  # type: ignore
+    _SENTENCE_TF_AVAILABLE = False
+
+try:
+    import numpy as np  # type: ignore
+    _NUMPY_AVAILABLE = True
+except Exception:
+    np = None  # type: ignore
+    _NUMPY_AVAILABLE = False
+
+try:
+    import faiss  # type: ignore
+    _FAISS_AVAILABLE = True
+except Exception:
+    faiss = None  # type: ignore
+    _FAISS_AVAILABLE = False
+
+
+class SemanticCache:
+    """In-memory vector cache of previously answered questions.
+
+    Near-duplicate questions ("what is bail?" vs "what is bail") miss an
+    exact-match LRU. Here each answered question is embedded once; an
+    incoming question whose embedding is close enough (cosine similarity
+    above the threshold) to a cached one returns the cached response
+    without rescanning storage.
+
+    Uses a FAISS ``IndexFlatIP`` when faiss is installed, otherwise a
+    plain NumPy dot product over a preallocated ring buffer — for a few
+    thousand normalized vectors the two are equivalent.
+    """
+
+    def __init__(self, threshold: float = 0.95, maxsize: int = 5000):
+        if not _SENTENCE_TF_AVAILABLE:
+            raise RuntimeError("sentence_transformers is not installed. Install it to use SemanticCache.")
+        if not _NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required to compute similarities.")
+        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._responses: list = []
+        self._next_slot = 0
+        if _FAISS_AVAILABLE:
+            self._index = faiss.IndexFlatIP(self.dim)
+            self._vectors = None
+        else:
+            self._index = None
+            self._vectors = np.zeros((maxsize, self.dim), dtype=np.float32)
+
+    def _encode(self, question: str):
+        """Embed a question as a normalized float32 vector."""
+        return self.model.encode(question, normalize_embeddings=True).astype(np.float32)
+
+    def lookup(self, question: str) -> Optional[dict]:
+        """Return the cached response for a semantically close question, or None."""
+        if not self._responses:
+            return None
+        emb = self._encode(question)
+        if self._index is not None:
+            scores, ids = self._index.search(emb[None, :], 1)
+            score, idx = float(scores[0, 0]), int(ids[0, 0])
+        else:
+            sims = self._vectors[:len(self._responses)] @ emb
+            idx = int(np.argmax(sims))
+            score = float(sims[idx])
+        if score > self.threshold:
+            return self._responses[idx]
+        return None
+
+    def store(self, question: str, response: dict):
+        """Cache the response served for a question."""
+        emb = self._encode(question)
+        if self._index is not None:
+            # IndexFlatIP has no cheap removal; flush wholesale when full
+            if self._index.ntotal >= self.maxsize:
+                self._index.reset()
+                self._responses.clear()
+            self._index.add(emb[None, :])
+            self._responses.append(response)
+        else:
+            # Ring buffer: overwrite the oldest slot once full
+            slot = self._next_slot % self.maxsize
+            if slot == len(self._responses):
+                self._responses.append(response)
+            else:
+                self._responses[slot] = response
+            self._vectors[slot] = emb
+            self._next_slot += 1
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._responses.clear()
+        self._next_slot = 0
+        if self._index is not None:
+            self._index.reset()
@@ -1,9 +1,82 @@
 import json
-from datetime import datetime
+import os
 from typing import Dict, List, Optional
 import re
 from difflib import SequenceMatcher
 
+from .config import get_settings
+
+# orjson parses large JSON several times faster than stdlib; fall back
+# to the stdlib parser when it is not installed
+try:
+    import orjson  # type: ignore
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore
+    _ORJSON_AVAILABLE = False
+
+# Optional semantic-search stack: when sentence-transformers (and ideally
+# faiss) are installed, similarity search runs over precomputed MiniLM
+# embeddings instead of per-pair SequenceMatcher diffs
+try:
+    from sentence_transformers import SentenceTransformer  # type: ignore
+    _SENTENCE_TF_AVAILABLE = True
+except Exception:
+    SentenceTransformer = None  # type: ignore
+    _SENTENCE_TF_AVAILABLE = False
+
+try:
+    import numpy as np  # type: ignore
+    _NUMPY_AVAILABLE = True
+except Exception:
+    np = None  # type: ignore
+    _NUMPY_AVAILABLE = False
+
+try:
+    import faiss  # type: ignore
+    _FAISS_AVAILABLE = True
+except Exception:
+    faiss = None  # type: ignore
+    _FAISS_AVAILABLE = False
+
+# Optional TF-IDF tier: much cheaper to build than transformer embeddings
+# and still replaces the per-pair SequenceMatcher diff with one sparse
+# matrix product per query
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
+    _SKLEARN_AVAILABLE = True
+except Exception:
+    TfidfVectorizer = None  # type: ignore
+    _SKLEARN_AVAILABLE = False
+
+# Optional RapidFuzz scorer: a C++ drop-in for SequenceMatcher.ratio,
+# typically 50-100x faster on the per-pair fallback path
+try:
+    from rapidfuzz import fuzz as _rf_fuzz  # type: ignore
+    _RAPIDFUZZ_AVAILABLE = True
+except Exception:
+    _rf_fuzz = None  # type: ignore
+    _RAPIDFUZZ_AVAILABLE = False
+
+# Optional Aho-Corasick automaton: answers "which corpus questions appear
+# inside this query" for all N questions in one linear scan instead of N
+# substring checks during the text-match fallback
+try:
+    import ahocorasick  # type: ignore
+    _AHOCORASICK_AVAILABLE = True
+except Exception:
+    ahocorasick = None  # type: ignore
+    _AHOCORASICK_AVAILABLE = False
+
+# Compiled once at import; clean_text runs on every similarity comparison
+_SAFE_RE = re.compile(r'[^\w\s\-.,?!]')
+
+# ASCII text (the common case) is stripped with a str.translate deletion
+# table instead of the regex engine — one C pass, same character set
+_ASCII_DELETE_TABLE = str.maketrans('', '', ''.join(
+    ch for ch in map(chr, range(128)) if _SAFE_RE.match(ch)
+))
+
 # Load the initial data
 INITIAL_DATA = {
   "qa_pairs": [
@@ -3417,7 +3490,10 @@ def clean_text(text: str) -> str:
     # Convert to lowercase and remove extra whitespace
     text = text.lower().strip()
     # Remove special characters except basic punctuation
-    text = re.sub(r'[^\w\s\-.,?!]', '', text)
+    if text.isascii():
+        text = text.translate(_ASCII_DELETE_TABLE)
+    else:
+        text = _SAFE_RE.sub('', text)
     # Normalize whitespace
     text = ' '.join(text.split())
     return text
@@ -3436,12 +3512,33 @@ def calculate_similarity(text1: str, text2: str) -> float:
         return 0.8
         
     # Use sequence matcher for more detailed comparison
+    if _RAPIDFUZZ_AVAILABLE:
+        return _rf_fuzz.ratio(text1, text2) / 100.0
     return SequenceMatcher(None, text1, text2).ratio()
 
 class JSONStorage:
     def __init__(self):
-        self._data = INITIAL_DATA
-        self._validate_data()
+        settings = get_settings()
+        self._path = os.path.join(settings.DATA_DIR, settings.QA_FILE)
+        self._mtime: Optional[float] = None
+        self._data: Optional[Dict] = None
+        # Embedding index state (built lazily when the optional deps exist)
+        self._embed_model = None
+        self._embed_index = None   # faiss.IndexFlatIP when faiss is available
+        self._embed_matrix = None  # normalized (N, d) float32 matrix otherwise
+        self._embed_version: Optional[float] = None
+        # Categories change only when the data does; cache them per version
+        self._categories_cache: Optional[List[str]] = None
+        self._categories_version: Optional[float] = None
+        self._automaton = None
+        self._automaton_version: Optional[float] = None
+        # TF-IDF index state (middle tier between embeddings and difflib)
+        self._tfidf_vec = None
+        self._tfidf_matrix = None
+        self._tfidf_version: Optional[float] = None
+        # Normalized question -> QA pair, rebuilt by _annotate_data
+        self._exact: Dict[str, Dict] = {}
+        self._load_data()
 
     def _validate_data(self):
         """Validate the data structure and content."""
@@ -3462,9 +3559,56 @@ class JSONStorage:
                     raise ValueError(f"Invalid QA pair: missing '{field}' field")
 
     def _load_data(self) -> Dict:
-        """Load data from memory."""
+        """Return the parsed QA data, re-reading the file only when it changes.
+
+        The parsed data is cached together with the file's mtime so repeated
+        calls (one per request) cost a single stat instead of a JSON parse.
+        Falls back to the bundled INITIAL_DATA when the file is missing.
+        """
+        try:
+            mtime = os.path.getmtime(self._path)
+        except OSError:
+            mtime = None
+
+        if self._data is None or mtime != self._mtime:
+            if mtime is None:
+                self._data = INITIAL_DATA
+            else:
+                try:
+                    with open(self._path, 'rb') as f:
+                        raw = f.read()
+                    self._data = orjson.loads(raw) if _ORJSON_AVAILABLE else json.loads(raw)
+                except (OSError, ValueError):
+                    self._data = INITIAL_DATA
+            self._mtime = mtime
+            self._validate_data()
+            self._annotate_data()
         return self._data
 
+    def get_data_version(self) -> float:
+        """Return a version token for the current data (the file mtime).
+
+        Changes whenever the underlying file changes, so it can key HTTP
+        validators like ETags.
+        """
+        self._load_data()
+        return self._mtime or 0.0
+
+    def _annotate_data(self):
+        """Precompute derived fields on each QA pair after (re)loading.
+
+        Underscore-prefixed keys are internal and stripped from API
+        responses by get_qa_pairs.
+        """
+        for qa in self._data['qa_pairs']:
+            qa['_qlower'] = qa['question'].lower()
+        # Keep the list sorted newest-first once per load, so get_qa_pairs
+        # slices instead of re-sorting on every request
+        self._data['qa_pairs'].sort(key=lambda qa: qa.get('created_at', ''), reverse=True)
+        # Exact-hit dictionary: most production traffic repeats canonical
+        # phrasings, which this answers in O(1) before any similarity scan
+        self._exact = {clean_text(qa['question']): qa for qa in self._data['qa_pairs']}
+
     def _save_data(self, data: Dict):
         """Save data to memory."""
         self._data = data
@@ -3481,28 +3625,147 @@ class JSONStorage:
                 category = category.lower()
                 qa_pairs = [qa for qa in qa_pairs if qa.get('category', '').lower() == category]
             
-            # Sort by creation date (newest first) and apply limit
-            def get_created_at(qa):
-                try:
-                    return qa.get('created_at', '')
-                except:
-                    return ''
-            
-            qa_pairs.sort(key=get_created_at, reverse=True)
-            return qa_pairs[:limit]
+            # Already sorted newest-first by _annotate_data; strip internal
+            # (underscore-prefixed) fields from the response
+            return [
+                {k: v for k, v in qa.items() if not k.startswith('_')}
+                for qa in qa_pairs[:limit]
+            ]
         except Exception as e:
             raise ValueError(f"Error fetching QA pairs: {str(e)}")
 
+    def _get_automaton(self):
+        """Return the corpus-question automaton, rebuilding it per data version.
+
+        None when pyahocorasick is not installed.
+        """
+        if not _AHOCORASICK_AVAILABLE:
+            return None
+        if self._automaton is None or self._automaton_version != self._mtime:
+            automaton = ahocorasick.Automaton()
+            for i, qa in enumerate(self._data['qa_pairs']):
+                automaton.add_word(clean_text(qa['question']), i)
+            automaton.make_automaton()
+            self._automaton = automaton
+            self._automaton_version = self._mtime
+        return self._automaton
+
+    def _ensure_embedding_index(self) -> bool:
+        """Build (or rebuild) the embedding index for the current data.
+
+        Returns False when the semantic stack is unavailable, in which
+        case callers fall back to SequenceMatcher scoring. Embeddings are
+        normalized so inner product equals cosine similarity.
+        """
+        if not (_SENTENCE_TF_AVAILABLE and _NUMPY_AVAILABLE):
+            return False
+        data = self._load_data()
+        if self._embed_version == self._mtime and (
+            self._embed_index is not None or self._embed_matrix is not None
+        ):
+            return True
+        if self._embed_model is None:
+            self._embed_model = SentenceTransformer('all-MiniLM-L6-v2')
+        embeddings = self._embed_model.encode(
+            [qa['question'] for qa in data['qa_pairs']],
+            batch_size=64,
+            normalize_embeddings=True
+        ).astype(np.float32)
+        if _FAISS_AVAILABLE:
+            index = faiss.IndexFlatIP(embeddings.shape[1])
+            index.add(embeddings)
+            self._embed_index = index
+            self._embed_matrix = None
+        else:
+            self._embed_index = None
+            self._embed_matrix = embeddings
+        self._embed_version = self._mtime
+        return True
+
+    def _find_similar_semantic_batch(self, questions: List[str]) -> List[List[Dict]]:
+        """Top-k semantic search for a batch of questions in one encode+search."""
+        settings = get_settings()
+        k = settings.MAX_RESULTS
+        threshold = settings.SIMILARITY_THRESHOLD
+        query = self._embed_model.encode(
+            [clean_text(q) for q in questions],
+            batch_size=32,
+            normalize_embeddings=True
+        ).astype(np.float32)
+        qa_pairs = self._data['qa_pairs']
+        if self._embed_index is not None:
+            scores, ids = self._embed_index.search(query, k)
+        else:
+            sims = query @ self._embed_matrix.T
+            ids = np.argsort(-sims, axis=1)[:, :k]
+            scores = np.take_along_axis(sims, ids, axis=1)
+        return [
+            [qa_pairs[int(i)] for s, i in zip(row_scores, row_ids)
+             if i >= 0 and s >= threshold]
+            for row_scores, row_ids in zip(scores, ids)
+        ]
+
+    def _ensure_tfidf_index(self) -> bool:
+        """Build (or rebuild) the TF-IDF index for the current data.
+
+        Returns False when sklearn/numpy are unavailable.
+        """
+        if not (_SKLEARN_AVAILABLE and _NUMPY_AVAILABLE):
+            return False
+        data = self._load_data()
+        if self._tfidf_version == self._mtime and self._tfidf_matrix is not None:
+            return True
+        self._tfidf_vec = TfidfVectorizer(lowercase=True, ngram_range=(1, 2))
+        self._tfidf_matrix = self._tfidf_vec.fit_transform(
+            [qa['question'] for qa in data['qa_pairs']]
+        )
+        self._tfidf_version = self._mtime
+        return True
+
+    def _find_similar_tfidf_batch(self, questions: List[str], threshold: float) -> List[List[Dict]]:
+        """Top-k TF-IDF cosine retrieval for a batch of questions."""
+        settings = get_settings()
+        k = settings.MAX_RESULTS
+        query = self._tfidf_vec.transform([clean_text(q) for q in questions])
+        # Rows are L2-normalized by TfidfVectorizer, so the product is cosine
+        scores = (query @ self._tfidf_matrix.T).toarray()
+        qa_pairs = self._data['qa_pairs']
+        results = []
+        for row in scores:
+            top = np.argsort(-row)[:k]
+            results.append([qa_pairs[int(i)] for i in top if row[i] >= threshold])
+        return results
+
+    def find_exact(self, question: str) -> Optional[Dict]:
+        """Return the QA pair whose normalized question matches exactly."""
+        self._load_data()
+        return self._exact.get(clean_text(question))
+
     def find_similar_questions(self, question: str, threshold: float = 0.5) -> List[Dict]:
         """Find similar questions using improved text matching."""
         try:
+            if self._ensure_embedding_index():
+                return self._find_similar_semantic_batch([question])[0]
+            if self._ensure_tfidf_index():
+                return self._find_similar_tfidf_batch([question], threshold)[0]
             data = self._load_data()
             question = clean_text(question)
-            
+
+            # One automaton pass resolves corpus-in-query containment for
+            # the whole corpus, replacing N per-pair substring scans
+            automaton = self._get_automaton()
+            contained = None
+            if automaton is not None:
+                contained = {idx for _, idx in automaton.iter(question)}
+
             # Calculate similarity scores for all questions
             scored_questions = []
-            for qa in data['qa_pairs']:
-                similarity = calculate_similarity(question, qa['question'])
+            for i, qa in enumerate(data['qa_pairs']):
+                if contained is not None and i in contained:
+                    qa_clean = clean_text(qa['question'])
+                    similarity = 1.0 if qa_clean == question else 0.8
+                else:
+                    similarity = calculate_similarity(question, qa['question'])
                 if similarity >= threshold:
                     scored_questions.append((similarity, qa))
             
@@ -3514,12 +3777,45 @@ class JSONStorage:
         except Exception as e:
             raise ValueError(f"Error finding similar questions: {str(e)}")
 
+    def find_similar_questions_batch(self, questions: List[str], threshold: float = 0.5) -> List[List[Dict]]:
+        """Batch variant of find_similar_questions.
+
+        Scores every corpus question against all queries in a single pass,
+        cleaning each corpus entry once instead of once per query.
+        """
+        try:
+            if self._ensure_embedding_index():
+                return self._find_similar_semantic_batch(questions)
+            if self._ensure_tfidf_index():
+                return self._find_similar_tfidf_batch(questions, threshold)
+            data = self._load_data()
+            cleaned = [clean_text(q) for q in questions]
+            scored: List[List[tuple]] = [[] for _ in questions]
+
+            for qa in data['qa_pairs']:
+                qa_clean = clean_text(qa['question'])
+                for i, query in enumerate(cleaned):
+                    similarity = calculate_similarity(query, qa_clean)
+                    if similarity >= threshold:
+                        scored[i].append((similarity, qa))
+
+            results = []
+            for matches in scored:
+                matches.sort(reverse=True, key=lambda x: x[0])
+                results.append([qa for score, qa in matches])
+            return results
+        except Exception as e:
+            raise ValueError(f"Error finding similar questions: {str(e)}")
+
     def get_categories(self) -> List[str]:
-        """Get all unique categories."""
+        """Get all unique categories (cached until the data changes)."""
         try:
             data = self._load_data()
-            # Get unique categories and filter out empty ones
-            categories = set(qa.get('category', '').strip() for qa in data['qa_pairs'])
-            return sorted([cat for cat in categories if cat])
+            if self._categories_cache is None or self._categories_version != self._mtime:
+                # Get unique categories and filter out empty ones
+                categories = set(qa.get('category', '').strip() for qa in data['qa_pairs'])
+                self._categories_cache = sorted([cat for cat in categories if cat])
+                self._categories_version = self._mtime
+            return self._categories_cache
         except Exception as e:
             raise ValueError(f"Error fetching categories: {str(e)}")
\ No newline at end of file
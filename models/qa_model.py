@@ -1,3 +1,10 @@
+import asyncio
+import base64
+import os
+import string
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Optional, List
 
 try:
@@ -14,6 +21,41 @@ except Exception:
     np = None  # type: ignore
     _NUMPY_AVAILABLE = False
 
+try:
+    import hnswlib  # type: ignore
+    _HNSWLIB_AVAILABLE = True
+except Exception:
+    hnswlib = None  # type: ignore
+    _HNSWLIB_AVAILABLE = False
+
+try:
+    import faiss  # type: ignore
+    _FAISS_AVAILABLE = True
+except Exception:
+    faiss = None  # type: ignore
+    _FAISS_AVAILABLE = False
+
+try:
+    import simsimd  # type: ignore
+    _SIMSIMD_AVAILABLE = True
+except Exception:
+    simsimd = None  # type: ignore
+    _SIMSIMD_AVAILABLE = False
+
+try:
+    from numba import njit, prange  # type: ignore
+    _NUMBA_AVAILABLE = True
+except Exception:
+    njit = prange = None  # type: ignore
+    _NUMBA_AVAILABLE = False
+
+try:
+    import onnxruntime  # type: ignore
+    _ONNXRUNTIME_AVAILABLE = True
+except Exception:
+    onnxruntime = None  # type: ignore
+    _ONNXRUNTIME_AVAILABLE = False
+
 try:
     from ..app.firebase import legal_qa_collection  # type: ignore
     _FIREBASE_AVAILABLE = True
@@ -21,6 +63,82 @@ except Exception:
     legal_qa_collection = None  # type: ignore
     _FIREBASE_AVAILABLE = False
 
+# Active sentence transformer; the env var keeps mpnet reachable for
+# deployments that already carry 768-d embeddings
+_MODEL_NAME = os.getenv('LEGALQA_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+
+# Pre-exported ONNX graph of the sentence transformer (produced offline
+# with `optimum-cli export onnx`); served via onnxruntime when present.
+# The file name is derived from the active model so a stale export from
+# a different model (and a different embedding dimension) is never
+# paired with the wrong tokenizer
+_ONNX_MODEL_PATH = os.path.join(
+    os.path.dirname(__file__), _MODEL_NAME.rsplit('/', 1)[-1] + '.onnx'
+)
+
+
+# Encode batching: concurrent queries encode together in one model call
+# instead of one forward pass each
+_ENCODE_WINDOW = 0.01  # seconds to wait for more questions
+_ENCODE_MAX = 32       # max questions per batch
+
+# Deletion table for question preprocessing: punctuation carries no
+# signal for the embedding model and normalizing it away makes repeated
+# phrasings share one cache entry
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+# FAQ-style traffic repeats a handful of questions; cache their
+# embeddings so repeats skip the forward pass entirely
+_ENCODE_CACHE_MAX = 4096
+
+
+@lru_cache(maxsize=4096)
+def _preprocess(question: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return ' '.join(question.lower().translate(_PUNCT_TABLE).split())
+
+
+# Corpus size at which flat HNSW memory becomes the bottleneck and the
+# compressed IVFPQ index takes over
+_IVFPQ_MIN_ROWS = 100_000
+
+# Quantization scale for int8-encoded embeddings: normalized components
+# lie in [-1, 1], so 127 uses the full int8 range
+_EMB_SCALE = 127.0
+
+
+def _decode_embedding(value):
+    """Decode a stored embedding to float32.
+
+    Handles every format in the collection: raw int8 bytes (current —
+    Firestore stores Python bytes natively and np.frombuffer views them
+    without boxing), base64-encoded int8 strings, and the legacy list
+    of floats.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        q8 = np.frombuffer(value, dtype=np.int8)
+        return q8.astype(np.float32) / _EMB_SCALE
+    if isinstance(value, str):
+        q8 = np.frombuffer(base64.b64decode(value), dtype=np.int8)
+        return q8.astype(np.float32) / _EMB_SCALE
+    return np.asarray(value, dtype=np.float32)
+
+
+if _NUMBA_AVAILABLE and _NUMPY_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dot_rows(q, M):  # pragma: no cover - compiled kernel
+        """Fused row-parallel dot products of one query against a matrix."""
+        n = M.shape[0]
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            s = np.float32(0.0)
+            for j in range(M.shape[1]):
+                s += q[j] * M[i, j]
+            out[i] = s
+        return out
+else:
+    _dot_rows = None
+
 
 class LegalQA:
     """Legal Question Answering system using semantic search."""
@@ -29,11 +147,261 @@ class LegalQA:
         """Initialize the QA system with the sentence transformer model."""
         if not _SENTENCE_TF_AVAILABLE:
             raise RuntimeError("sentence_transformers is not installed. Install it to use LegalQA.")
-        self.model = SentenceTransformer('all-mpnet-base-v2')
+        # MiniLM (384-d) encodes ~5x faster than mpnet-base at comparable
+        # short-question recall; see _MODEL_NAME for the override
+        self.model = SentenceTransformer(_MODEL_NAME)
+        self._dim = self.model.get_sentence_embedding_dimension()
+        try:
+            import torch
+            torch.set_num_threads(os.cpu_count() or 1)
+        except Exception:
+            pass
+        # Encode batcher state; the queue is bound to an event loop, so it
+        # is recreated if the running loop changes (serverless runtimes)
+        self._encode_queue = None
+        self._encode_task = None
+        self._encode_loop = None
+        # One dedicated encode thread: keeps the forward pass off the
+        # event loop without oversubscribing torch's own thread pool
+        from concurrent.futures import ThreadPoolExecutor
+        self._encoder_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="encode")
+        # LRU of preprocessed question -> embedding
+        self._encode_cache: OrderedDict = OrderedDict()
+        # Optional ONNX fast path: serve the exported graph through
+        # onnxruntime, falling back to the PyTorch model otherwise
+        self._onnx_session = None
+        self._onnx_tokenizer = None
+        if _ONNXRUNTIME_AVAILABLE and _NUMPY_AVAILABLE and os.path.exists(_ONNX_MODEL_PATH):
+            try:
+                from transformers import AutoTokenizer
+                opts = onnxruntime.SessionOptions()
+                opts.graph_optimization_level = (
+                    onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+                )
+                self._onnx_session = onnxruntime.InferenceSession(
+                    _ONNX_MODEL_PATH, sess_options=opts,
+                    providers=['CPUExecutionProvider'],
+                )
+                self._onnx_tokenizer = AutoTokenizer.from_pretrained(_MODEL_NAME)
+            except Exception:
+                self._onnx_session = None
+                self._onnx_tokenizer = None
+        # Collection snapshot cache, refreshed at most once per TTL: the
+        # row-normalized embedding matrix, row-aligned metadata, category
+        # set, and the HNSW index built over the same rows. A generation
+        # counter tells the index when the snapshot it was built from is
+        # gone
+        self._embs = None
+        self._emb_meta: list = []
+        self._categories: set = set()
+        # Reusable similarity buffer, grown only when the corpus does
+        self._scratch_sims = None
+        self._cache_loaded_at = 0.0
+        self._cache_generation = 0
+        self._index = None
+        self._index_backend = None
+        self._index_generation = -1
 
-    def encode_question(self, question: str) -> List[float]:
-        """Encode a question into a vector using the sentence transformer."""
-        return self.model.encode(question).tolist()
+    def _encode_onnx(self, texts: List[str]):
+        """Tokenize, run the ONNX graph, mean-pool and L2-normalize."""
+        enc = self._onnx_tokenizer(
+            texts, padding=True, truncation=True, return_tensors='np'
+        )
+        inputs = {k: v for k, v in enc.items()
+                  if k in {i.name for i in self._onnx_session.get_inputs()}}
+        hidden = self._onnx_session.run(None, inputs)[0]
+        mask = enc['attention_mask'][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.clip(norms, 1e-12, None)
+
+    def _encode_texts(self, texts: List[str]):
+        """Encode a batch of texts with the fastest available backend."""
+        if self._onnx_session is not None:
+            return self._encode_onnx(texts)
+        return self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+
+    def _stream_all(self):
+        """Yield every document snapshot, fetching in parallel when possible.
+
+        A plain stream() sums per-document RTT on one channel; when the
+        underlying client exposes get_all, document refs are listed once
+        and fetched in 300-doc batches across a small thread pool.
+        """
+        client = getattr(legal_qa_collection, '_client', None)
+        if client is None or not hasattr(client, 'get_all'):
+            yield from legal_qa_collection.stream()
+            return
+        refs = list(legal_qa_collection.list_documents())
+        if not refs:
+            return
+        chunks = [refs[i:i + 300] for i in range(0, len(refs), 300)]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as ex:
+            for batch in ex.map(lambda c: list(client.get_all(c)), chunks):
+                for snap in batch:
+                    if snap.exists:
+                        yield snap
+
+    def _refresh(self, max_age: float = 60.0):
+        """Stream the collection into the local snapshot when it is stale.
+
+        Queries between refreshes run entirely against memory — zero
+        Firestore reads on the hot path.
+        """
+        now = time.monotonic()
+        if self._embs is not None and now - self._cache_loaded_at < max_age:
+            return
+        metas, embeddings, categories = [], [], set()
+        for qa in self._stream_all():
+            qa_data = qa.to_dict()
+            category = qa_data.get('category')
+            if category:
+                categories.add(category)
+            embedding = qa_data.get('embedding')
+            if embedding is None or (not isinstance(embedding, str) and not embedding):
+                continue
+            metas.append({
+                'id': qa.id,
+                'question': qa_data['question'],
+                'answer': qa_data['answer'],
+            })
+            vec = _decode_embedding(embedding)
+            if vec.shape[0] != self._dim:
+                # Written by a different model (e.g. before a MiniLM/mpnet
+                # switch); unusable until reembed_collection() runs
+                metas.pop()
+                continue
+            embeddings.append(vec)
+        embs = np.asarray(embeddings, dtype=np.float32).reshape(len(metas), self._dim)
+        # Normalize rows once at load (covers docs written before
+        # normalized storage); cosine then reduces to a plain dot product
+        norms = np.linalg.norm(embs, axis=1, keepdims=True)
+        np.clip(norms, 1e-12, None, out=norms)
+        self._embs = embs / norms
+        self._emb_meta = metas
+        self._categories = categories
+        self._cache_loaded_at = now
+        self._cache_generation += 1
+
+    def _ensure_index(self) -> bool:
+        """(Re)build the ANN index over the current snapshot; False if unavailable.
+
+        Flat HNSW for ordinary corpus sizes; past _IVFPQ_MIN_ROWS rows a
+        Faiss IVFPQ index with an HNSW coarse quantizer keeps memory
+        sublinear in exchange for a small recall loss.
+        """
+        if not (_NUMPY_AVAILABLE and _FIREBASE_AVAILABLE):
+            return False
+        self._refresh()
+        if self._index_generation == self._cache_generation:
+            return self._index is not None
+        self._index = None
+        self._index_backend = None
+        n = len(self._emb_meta)
+        if _FAISS_AVAILABLE and n >= _IVFPQ_MIN_ROWS:
+            d = self._embs.shape[1]
+            nlist = min(4096, max(64, int(4 * np.sqrt(n))))
+            quantizer = faiss.IndexHNSWFlat(d, 32, faiss.METRIC_INNER_PRODUCT)
+            index = faiss.IndexIVFPQ(quantizer, d, nlist, 96, 8,
+                                     faiss.METRIC_INNER_PRODUCT)
+            index.train(self._embs)
+            index.add(self._embs)
+            index.nprobe = 16
+            self._index = index
+            self._index_backend = 'ivfpq'
+        elif _HNSWLIB_AVAILABLE:
+            index = hnswlib.Index(space='cosine', dim=self._embs.shape[1])
+            index.init_index(max_elements=max(n, 1024), ef_construction=200, M=16)
+            if n:
+                # Index keys are snapshot row numbers, so hits resolve
+                # through the same _emb_meta list the dense path uses
+                index.add_items(self._embs, np.arange(n))
+            index.set_ef(64)
+            self._index = index
+            self._index_backend = 'hnsw'
+        self._index_generation = self._cache_generation
+        return self._index is not None
+
+    def _cache_add(self, doc_id: str, question: str, answer: str, embedding, category: str):
+        """Append a freshly written QA pair to the live snapshot."""
+        if self._embs is None:
+            return
+        vec = np.asarray([embedding], dtype=np.float32)
+        vec /= max(float(np.linalg.norm(vec)), 1e-12)
+        self._embs = np.vstack([self._embs, vec])
+        self._emb_meta.append({'id': doc_id, 'question': question, 'answer': answer})
+        if category:
+            self._categories.add(category)
+        if self._index is not None and self._index_generation == self._cache_generation:
+            if self._index_backend == 'ivfpq':
+                # Sequential faiss ids stay aligned with snapshot rows
+                self._index.add(vec)
+            else:
+                key = len(self._emb_meta) - 1
+                if key >= self._index.get_max_elements():
+                    self._index.resize_index(self._index.get_max_elements() * 2)
+                self._index.add_items(vec, [key])
+
+    async def _encode_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._encode_queue.get()]
+            deadline = loop.time() + _ENCODE_WINDOW
+            while len(items) < _ENCODE_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._encode_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                # Off the event loop: other requests keep being served
+                # while the model runs on the encoder thread
+                embeddings = await loop.run_in_executor(
+                    self._encoder_pool, self._encode_texts, [text for text, _ in items]
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(items, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+    async def _encode(self, question: str):
+        """Encode via the coalescing batcher: bursts share one model call.
+
+        Questions are preprocessed first so trivially different phrasings
+        hit the same cache entry, and repeat questions skip the model.
+        """
+        question = self.preprocess_question(question)
+        cached = self._encode_cache.get(question)
+        if cached is not None:
+            self._encode_cache.move_to_end(question)
+            return cached
+        loop = asyncio.get_running_loop()
+        if self._encode_queue is None or self._encode_loop is not loop:
+            self._encode_queue = asyncio.Queue()
+            self._encode_loop = loop
+            self._encode_task = loop.create_task(self._encode_worker())
+        future = loop.create_future()
+        await self._encode_queue.put((question, future))
+        embedding = await future
+        self._encode_cache[question] = embedding
+        if len(self._encode_cache) > _ENCODE_CACHE_MAX:
+            self._encode_cache.popitem(last=False)
+        return embedding
+
+    def encode_question(self, question: str):
+        """Encode a question into a vector using the sentence transformer.
+
+        Returns the ndarray as-is; callers that need a Python list can
+        tolist() it themselves, and the hot paths never should.
+        """
+        return self.model.encode(question)
 
     async def find_similar_questions(
         self,
@@ -46,40 +414,76 @@ class LegalQA:
             raise RuntimeError("Firebase is not configured in this project (missing app.firebase).")
         if not _NUMPY_AVAILABLE:
             raise RuntimeError("numpy is required to compute similarities.")
-        # Encode the input question
-        question_embedding = self.model.encode(question)
-
-        # Get all QA pairs from Firestore
-        qa_docs = legal_qa_collection.stream()
-
-        similarities = []
-        for qa in qa_docs:
-            qa_data = qa.to_dict()
-            stored_embedding = qa_data.get('embedding')
-
-            if stored_embedding:
-                # Convert stored embedding back to numpy array
-                stored_embedding = np.array(stored_embedding)
-                # Calculate cosine similarity
-                similarity = np.dot(question_embedding, stored_embedding) / (
-                    np.linalg.norm(question_embedding) * np.linalg.norm(stored_embedding)
-                )
+        # Encode the input question (batched with concurrent callers)
+        question_embedding = await self._encode(question)
 
-                if similarity >= threshold:
-                    similarities.append({
-                        'id': qa.id,
-                        'question': qa_data['question'],
-                        'answer': qa_data['answer'],
-                        'similarity': float(similarity)
-                    })
+        # Sublinear ANN lookup against the in-memory index when available
+        if self._ensure_index():
+            k = min(max_results, len(self._emb_meta))
+            if k == 0:
+                return []
+            qv = np.asarray([question_embedding], dtype=np.float32)
+            results = []
+            if self._index_backend == 'ivfpq':
+                qv = qv / max(float(np.linalg.norm(qv)), 1e-12)
+                scores, labels = self._index.search(qv, k)
+                for key, score in zip(labels[0], scores[0]):
+                    # inner product of unit vectors is the cosine itself
+                    if key >= 0 and score >= threshold:
+                        results.append({**self._emb_meta[int(key)], 'similarity': float(score)})
+            else:
+                labels, distances = self._index.knn_query(qv, k=k)
+                for key, dist in zip(labels[0], distances[0]):
+                    similarity = 1.0 - float(dist)  # hnswlib returns cosine distance
+                    if similarity >= threshold:
+                        results.append({**self._emb_meta[int(key)], 'similarity': similarity})
+            return results
 
-        # Sort by similarity score and return top results
-        similarities.sort(key=lambda x: x['similarity'], reverse=True)
-        return similarities[:max_results]
+        # Dense path: one matrix-vector product scores every document
+        self._refresh()
+        if not self._emb_meta:
+            return []
+        q = np.asarray(question_embedding, dtype=np.float32)
+        # Rows are unit length, so normalizing the query once makes the
+        # matmul itself the cosine similarity
+        q /= max(float(np.linalg.norm(q)), 1e-12)
+        if _SIMSIMD_AVAILABLE:
+            # SimSIMD dispatches to AVX-512/NEON kernels; cdist returns
+            # cosine distance, so flip it back to similarity
+            sims = 1.0 - np.asarray(
+                simsimd.cdist(q[None, :], self._embs, metric='cosine')
+            ).ravel()
+        elif _dot_rows is not None:
+            # Numba kernel: prange across rows with fused accumulation,
+            # no temporaries — rows are unit length so the dot is cosine
+            sims = _dot_rows(q, self._embs)
+        else:
+            # Write into the reusable scratch buffer instead of
+            # allocating a fresh result array per query
+            n = self._embs.shape[0]
+            if self._scratch_sims is None or self._scratch_sims.shape[0] < n:
+                self._scratch_sims = np.empty(max(n, 1024), dtype=np.float32)
+            sims = np.dot(self._embs, q, out=self._scratch_sims[:n])
+        if max_results == 1:
+            # Argmax instead of sorting everything to take element [0]
+            best = int(np.argmax(sims))
+            if sims[best] < threshold:
+                return []
+            return [{**self._emb_meta[best], 'similarity': float(sims[best])}]
+        idx = np.where(sims >= threshold)[0]
+        if len(idx) > max_results:
+            # Partial selection: O(N) argpartition, then sort only the k kept
+            idx = idx[np.argpartition(-sims[idx], max_results)[:max_results]]
+        top = idx[np.argsort(-sims[idx])]
+        return [
+            {**self._emb_meta[int(i)], 'similarity': float(sims[i])}
+            for i in top
+        ]
 
     async def find_answer(self, question: str) -> Optional[str]:
         """Find the best answer for a given question."""
-        similar_questions = await self.find_similar_questions(question)
+        # Only the best hit is needed, so skip ranking the rest
+        similar_questions = await self.find_similar_questions(question, max_results=1)
 
         if not similar_questions:
             return None
@@ -96,33 +500,104 @@ class LegalQA:
         """Add a new QA pair to the database."""
         if not _FIREBASE_AVAILABLE:
             raise RuntimeError("Firebase is not configured in this project (missing app.firebase).")
-        # Encode the question
-        embedding = self.encode_question(question)
+        # Encode and L2-normalize: embeddings are immutable, so paying the
+        # norm once at write time removes it from every future query
+        v = self.model.encode(question)
+        if _NUMPY_AVAILABLE:
+            v = np.asarray(v, dtype=np.float32)
+            v = v / max(float(np.linalg.norm(v)), 1e-12)
+            # int8 quantization cuts the stored payload ~4x versus a list
+            # of Python floats; raw bytes map to Firestore's native bytes
+            # type with no base64 inflation and decode via one frombuffer
+            embedding = np.round(v * _EMB_SCALE).astype(np.int8).tobytes()
+        else:
+            embedding = v.tolist()
 
         # Add to Firestore
         doc_ref = legal_qa_collection.add({
             'question': question,
             'answer': answer,
             'category': category,
-            'embedding': embedding
+            'embedding': embedding,
+            'embedding_scale': 1.0 / _EMB_SCALE,
         })
 
+        if _NUMPY_AVAILABLE:
+            self._cache_add(doc_ref.id, question, answer, v, category)
         return doc_ref.id
 
+    def reembed_collection(self, batch_size: int = 256) -> int:
+        """One-time migration: re-embed every stored question with the
+        current model (needed after changing LEGALQA_MODEL, since the
+        embedding dimension changes with it). Returns documents updated.
+        """
+        if not _FIREBASE_AVAILABLE:
+            raise RuntimeError("Firebase is not configured in this project (missing app.firebase).")
+        if not _NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required to re-embed the collection.")
+        snaps = [qa for qa in self._stream_all() if qa.to_dict().get('question')]
+        updated = 0
+        for start in range(0, len(snaps), batch_size):
+            batch = snaps[start:start + batch_size]
+            vectors = self.model.encode(
+                [qa.to_dict()['question'] for qa in batch],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            ).astype(np.float32)
+            for qa, v in zip(batch, vectors):
+                q8 = np.round(v * _EMB_SCALE).astype(np.int8)
+                qa.reference.update({
+                    'embedding': q8.tobytes(),
+                    'embedding_scale': 1.0 / _EMB_SCALE,
+                })
+                updated += 1
+        return updated
+
+    def normalize_stored_embeddings(self) -> int:
+        """One-time migration: L2-normalize embeddings already in Firestore.
+
+        Returns the number of documents rewritten.
+        """
+        if not _FIREBASE_AVAILABLE:
+            raise RuntimeError("Firebase is not configured in this project (missing app.firebase).")
+        if not _NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required to normalize embeddings.")
+        updated = 0
+        for qa in legal_qa_collection.stream():
+            embedding = qa.to_dict().get('embedding')
+            if not embedding or isinstance(embedding, (str, bytes, bytearray)):
+                continue  # missing, or already the normalized int8 format
+            v = np.asarray(embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(v))
+            if abs(norm - 1.0) < 1e-3:
+                continue  # already normalized
+            qa.reference.update({'embedding': (v / max(norm, 1e-12)).tolist()})
+            updated += 1
+        return updated
+
     def preprocess_question(self, question: str) -> str:
-        """Preprocess the question for better matching."""
-        # TODO: Implement question preprocessing
-        # - Remove punctuation
-        # - Normalize text
-        # - Remove stop words
-        # - Lemmatization
-        return question.strip().lower()
+        """Preprocess the question for better matching.
+
+        Lowercases, strips punctuation and collapses whitespace (memoized
+        at module level). Stop-word removal and lemmatization are left
+        out deliberately: the sentence transformer handles both and
+        removing words can change its output.
+        """
+        return _preprocess(question.strip())
 
     async def get_question_categories(self) -> List[str]:
         """Get all unique categories of questions in the database (Firebase)."""
         if not _FIREBASE_AVAILABLE:
             raise RuntimeError("Firebase is not configured in this project (missing app.firebase).")
-        docs = legal_qa_collection.stream()
+        if _NUMPY_AVAILABLE:
+            # Served from the TTL snapshot alongside the embeddings
+            self._refresh()
+            return sorted(self._categories)
+
+        # Projection query: only the category field comes over the wire,
+        # not the multi-KB embedding stored beside it
+        docs = legal_qa_collection.select(['category']).stream()
 
         categories = set()
 